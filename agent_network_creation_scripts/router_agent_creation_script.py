@@ -1,5 +1,7 @@
 import os
 import json
+import hashlib
+import py_compile
 from typing import List, Dict, Any
 import openai
 from dotenv import load_dotenv
@@ -7,6 +9,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Maps each generated file to the hash of the inputs it was built from,
+# so regeneration with unchanged configs is skipped entirely
+MANIFEST_FILE = "router_manifest.json"
+
 class RouterAgentGenerator:
     """Generates router-based multi-agent setup files based on provided configurations."""
     
@@ -57,13 +63,14 @@ class RouterAgentGenerator:
         if not self.validate_agent_configs(agent_configs):
             return ""
 
-        # Generate the file content
-        file_content = self._generate_imports()
-        file_content += self._generate_agent_network_class(agent_configs, target_agent_name)
-        file_content += self._generate_router_class(agent_configs)
-        file_content += self._generate_main_block(target_agent_name)
-        
-        return file_content
+        # Generate the file content in one join instead of repeated
+        # string concatenation
+        return "".join([
+            self._generate_imports(),
+            self._generate_agent_network_class(agent_configs, target_agent_name),
+            self._generate_router_class(agent_configs),
+            self._generate_main_block(target_agent_name),
+        ])
 
     def _generate_imports(self) -> str:
         """Generate the imports section of the file."""
@@ -82,22 +89,30 @@ load_dotenv()
         """Generate the agent network class."""
         class_name = f"{target_agent_name.capitalize()}Agent"
         
-        # Generate agent initialization code
-        agent_init_code = "        # Set up agent network\n"
-        agent_init_code += f"        self.network = AgentNetwork(name=\"{target_agent_name.capitalize()} Network\")\n\n"
-        agent_init_code += "        # Add agents to the network\n"
-        
+        # Generate agent initialization code; collected in a list and
+        # joined once, so N agents cost N appends rather than N
+        # reallocations of an ever-growing string
+        init_lines = [
+            "        # Set up agent network",
+            f"        self.network = AgentNetwork(name=\"{target_agent_name.capitalize()} Network\")",
+            "",
+            "        # Add agents to the network",
+        ]
         for config in agent_configs:
-            agent_init_code += f"        {config['name']}_url = f\"http://localhost:{config['port']}\"\n"
-            agent_init_code += f"        self.network.add(\"{config['name']}\", {config['name']}_url)\n"
-        
-        agent_init_code += "\n        # Create an OpenAI client for routing decisions\n"
-        agent_init_code += "        self.openai_client = self._initialize_openai_client()\n\n"
-        agent_init_code += "        # Create the router\n"
-        agent_init_code += "        self.router = AIRouterWithOpenAI(\n"
-        agent_init_code += "            llm_client=self.openai_client,\n"
-        agent_init_code += "            agent_network=self.network\n"
-        agent_init_code += "        )\n"
+            init_lines.append(f"        {config['name']}_url = f\"http://localhost:{config['port']}\"")
+            init_lines.append(f"        self.network.add(\"{config['name']}\", {config['name']}_url)")
+        init_lines.extend([
+            "",
+            "        # Create an OpenAI client for routing decisions",
+            "        self.openai_client = self._initialize_openai_client()",
+            "",
+            "        # Create the router",
+            "        self.router = AIRouterWithOpenAI(",
+            "            llm_client=self.openai_client,",
+            "            agent_network=self.network",
+            "        )",
+        ])
+        agent_init_code = "\n".join(init_lines) + "\n"
 
         return f'''class {class_name}:
     """A network of {target_agent_name} agents with intelligent routing."""
@@ -189,7 +204,17 @@ load_dotenv()
             for config in agent_configs
         ])
 
-        return f'''class AIRouterWithOpenAI(AIAgentRouter):
+        # Lowercase-name lookup table, embedded as a literal so the
+        # generated router matches replies without scanning the full
+        # config list per query
+        name_lut = {config['name'].lower(): config['name'] for config in agent_configs}
+
+        return f'''# Lowercase-name lookup used to match the model's reply; evaluated
+# once at import rather than per router instance
+_AGENT_NAME_LUT = {name_lut}
+
+
+class AIRouterWithOpenAI(AIAgentRouter):
     """AI-powered router using OpenAI to make routing decisions."""
     
     def __init__(self, llm_client, agent_network):
@@ -197,6 +222,13 @@ load_dotenv()
         self.client = llm_client
         self.agent_network = agent_network
         self.agent_descriptions = self._get_agent_descriptions()
+        # The routing prompt does not depend on the query, so build it
+        # once here instead of on every route_query call
+        self._system_prompt = self._build_routing_prompt()
+        self._name_lut = _AGENT_NAME_LUT
+        # Repeated queries route identically, so successful decisions
+        # are cached per normalized query
+        self._route_cache = {{}}
     
     def _get_agent_descriptions(self):
         """Get descriptions of all agents in the network."""
@@ -208,13 +240,16 @@ load_dotenv()
     
     def route_query(self, query):
         """Route a query to the most appropriate agent."""
-        prompt = self._build_routing_prompt(query)
+        cache_key = " ".join(query.lower().split())
+        cached = self._route_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             response = self.client.chat.completions.create(
                 model=os.getenv("OPENAI_MODEL", "o4-mini-2025-04-16"),
                 messages=[
-                    {{"role": "system", "content": prompt}},
+                    {{"role": "system", "content": self._system_prompt}},
                     {{"role": "user", "content": query}}
                 ],
                 temperature=0
@@ -223,20 +258,27 @@ load_dotenv()
             result = response.choices[0].message.content.strip().lower()
             
             # Parse the response to determine the agent and confidence
-            for agent_config in {agent_configs}:
-                if agent_config['name'] in result:
-                    return agent_config['name'], 0.9 if "high confidence" in result else 0.7
+            decision = None
+            for lowercase_name, canonical_name in self._name_lut.items():
+                if lowercase_name in result:
+                    decision = (canonical_name, 0.9 if "high confidence" in result else 0.7)
+                    break
             
-            # Default to first agent if unclear
-            return {agent_configs[0]['name']}, 0.5
+            if decision is None:
+                # Default to first agent if unclear
+                decision = ("{agent_configs[0]['name']}", 0.5)
+            
+            self._route_cache[cache_key] = decision
+            return decision
                 
         except Exception as e:
             print(f"Error routing query: {{str(e)}}")
-            # Default to first agent on error
-            return {agent_configs[0]['name']}, 0.5
+            # Default to first agent on error; not cached so a transient
+            # failure does not pin the fallback for that query
+            return "{agent_configs[0]['name']}", 0.5
     
-    def _build_routing_prompt(self, query):
-        """Build a prompt for the routing decision."""
+    def _build_routing_prompt(self):
+        """Build the static prompt for routing decisions."""
         return f"""
 You are a query router for a multi-agent system. Your job is to determine which agent should handle a given query based on its content.
 
@@ -308,6 +350,53 @@ if __name__ == "__main__":
     print(f"\\nThank you for using the {target_agent_name.capitalize()} Network!")
 '''
 
+    @staticmethod
+    def _config_hash(agent_configs: List[Dict[str, Any]], target_agent_name: str) -> str:
+        """Hash the inputs that determine the generated file content."""
+        payload = json.dumps(
+            {"agents": agent_configs, "target": target_agent_name},
+            sort_keys=True
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def write_router_file(self, agent_configs: List[Dict[str, Any]], target_agent_name: str,
+                          output_filename: str = None) -> str:
+        """Generate the router file on disk, reusing it when unchanged.
+
+        The manifest records the input hash each file was generated
+        from; a matching hash means the existing file (and its cached
+        bytecode) is current, so generation, the disk write, and the
+        byte-compile are all skipped.
+        """
+        if output_filename is None:
+            output_filename = f"{target_agent_name}_router.py"
+
+        config_hash = self._config_hash(agent_configs, target_agent_name)
+
+        manifest = {}
+        if os.path.exists(MANIFEST_FILE):
+            with open(MANIFEST_FILE, "r") as f:
+                manifest = json.load(f)
+
+        if manifest.get(output_filename) == config_hash and os.path.exists(output_filename):
+            print(f"Router file up to date: {output_filename}")
+            return output_filename
+
+        file_content = self.generate_router_file(agent_configs, target_agent_name)
+        with open(output_filename, "w") as f:
+            f.write(file_content)
+
+        # Byte-compile now so the first import of the generated module
+        # does not pay the tokenize/compile cost (and syntax errors in
+        # the template surface here rather than at runtime)
+        py_compile.compile(output_filename, doraise=True)
+
+        manifest[output_filename] = config_hash
+        with open(MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        return output_filename
+
 def main():
     """Main function to demonstrate usage."""
     # Example agent configurations
@@ -329,14 +418,10 @@ def main():
     # Create the generator
     generator = RouterAgentGenerator()
     
-    # Generate the router file
+    # Generate the router file, skipping the work if the configs have
+    # not changed since the last run
     target_agent_name = "text_processing_1"
-    file_content = generator.generate_router_file(example_configs, target_agent_name)
-    
-    # Write the generated content to a file
-    output_filename = f"{target_agent_name}_router.py"
-    with open(output_filename, "w") as f:
-        f.write(file_content)
+    output_filename = generator.write_router_file(example_configs, target_agent_name)
     
     print(f"Generated router file: {output_filename}")
 
@@ -3,14 +3,20 @@ import os
 from dotenv import load_dotenv
 import asyncio
 import openai
+from functools import lru_cache
 import pandas as pd
 import json
 
 # Load environment variables
 load_dotenv()
 
+@lru_cache(maxsize=1)
 def initialize_openai_client():
-    """Initialize OpenAI client with fallback to Azure OpenAI."""
+    """Initialize OpenAI client with fallback to Azure OpenAI.
+
+    Cached so every network/router in the process shares one client
+    and its connection pool instead of rebuilding both per instance.
+    """
     try:
         # Try to initialize the default OpenAI client
         return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -107,6 +113,9 @@ class AIRouterWithOpenAI(AIAgentRouter):
         self.client = llm_client
         self.agent_network = agent_network
         self.agent_descriptions = self._get_agent_descriptions()
+        # Routing decisions keyed by normalized query text; repeated
+        # queries skip the LLM round trip entirely
+        self._route_cache = {}
         
     def _get_agent_descriptions(self):
         """Get descriptions of all agents in the network."""
@@ -118,6 +127,11 @@ class AIRouterWithOpenAI(AIAgentRouter):
     
     def route_query(self, query):
         """Route a query to the most appropriate agent."""
+        cache_key = " ".join(query.lower().split())
+        cached = self._route_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = self._build_routing_prompt(query)
         
         try:
@@ -134,14 +148,17 @@ class AIRouterWithOpenAI(AIAgentRouter):
             
             # Parse the response to determine the agent and confidence
             if "data_analysis" in result:
-                return "data_analysis", 0.9 if "high confidence" in result else 0.7
+                decision = ("data_analysis", 0.9 if "high confidence" in result else 0.7)
             elif "data_visualization" in result:
-                return "data_visualization", 0.9 if "high confidence" in result else 0.7
+                decision = ("data_visualization", 0.9 if "high confidence" in result else 0.7)
             elif "data_wrangling" in result:
-                return "data_wrangling", 0.9 if "high confidence" in result else 0.7
+                decision = ("data_wrangling", 0.9 if "high confidence" in result else 0.7)
             else:
                 # Default to data analysis if unclear
-                return "data_analysis", 0.5
+                decision = ("data_analysis", 0.5)
+
+            self._route_cache[cache_key] = decision
+            return decision
                 
         except Exception as e:
             print(f"Error routing query: {str(e)}")
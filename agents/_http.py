@@ -0,0 +1,15 @@
+"""Pooled HTTP session shared by the agents' API calls.
+
+A bare requests.post opens and tears down a TCP (and TLS) connection
+per call. One module-level Session keeps connections alive across
+calls and across agent instances.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+session = requests.Session()
+
+# Keep a modest pool of persistent connections per host.
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
@@ -0,0 +1,43 @@
+"""Small in-memory LRU cache for LLM call results.
+
+Repeated requests with the same goal and inputs return the cached
+completion instead of paying another OpenAI round trip.
+"""
+import unicodedata
+from collections import OrderedDict
+
+# Maximum number of cached completions before the least recently
+# used entry is evicted.
+MAX_ENTRIES = 1024
+
+_cache = OrderedDict()
+
+
+def normalize(text):
+    """Normalize text so trivially different inputs share a cache entry.
+
+    Applies Unicode NFKC normalization, lowercases, and collapses runs
+    of whitespace, so edits like casing or extra spaces still hit.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def make_key(goal, inputs):
+    """Build a cache key from the agent goal and the call inputs."""
+    return f"{goal}\x1f{normalize(str(inputs))}"
+
+
+def get(key):
+    """Return the cached result for key, or None on a miss."""
+    result = _cache.get(key)
+    if result is not None:
+        _cache.move_to_end(key)
+    return result
+
+
+def put(key, result):
+    """Store a result, evicting the least recently used entry if full."""
+    _cache[key] = result
+    _cache.move_to_end(key)
+    if len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
@@ -0,0 +1,24 @@
+"""Shared helpers for agent task handling."""
+
+
+def _wrap_raw(content):
+    return {"raw_input": content}
+
+
+# Dispatch on the exact content type instead of an isinstance chain.
+# A dict lookup is one hash probe regardless of how many content
+# types get added here later.
+_EXTRACTORS = {
+    dict: lambda content: content,
+    str: _wrap_raw,
+}
+
+
+def extract_inputs(content):
+    """Extract the inputs dict from a task message's content.
+
+    The handler for the content's exact type is resolved through a
+    module-level dispatch table; unrecognized types fall back to
+    being wrapped as raw input.
+    """
+    return _EXTRACTORS.get(type(content), _wrap_raw)(content)
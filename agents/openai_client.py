@@ -0,0 +1,26 @@
+"""Process-wide OpenAI client shared by the agents.
+
+Every agent used to build its own client in __init__, which repeats
+credential lookup and HTTP connection-pool setup per instance. The
+client is thread-safe, so a single cached instance serves them all.
+"""
+import os
+
+import openai
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """Return the shared OpenAI client, creating it on first call.
+
+    Azure OpenAI is selected when AZURE_OPENAI_ENDPOINT is configured;
+    otherwise the default OpenAI client is used.
+    """
+    if os.getenv("AZURE_OPENAI_ENDPOINT"):
+        return openai.AzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION")
+        )
+    return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -1,10 +1,18 @@
 from python_a2a import A2AServer, skill, agent, TaskStatus, TaskState
 import os
 import requests
-import openai
-import json
+import orjson
+from functools import cached_property
 from typing import Dict, Any
 from dotenv import load_dotenv
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+from agents import _http
+from agents._taskutil import extract_inputs
+from agents.openai_client import get_openai_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,27 +30,23 @@ class ProductDescriptionGeneratorAgent(A2AServer):
         self.goal = "Create persuasive and SEO-friendly product descriptions using given product data"
         self.tags = ['ecommerce', 'copywriting', 'product-description']
         self.port = 5014
-        self.client = self._initialize_openai_client()
-    
-    def _initialize_openai_client(self):
-        """Initialize OpenAI client with fallback to Azure OpenAI."""
-        try:
-            # Try to initialize the default OpenAI client
-            return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        except Exception as e:
-            print(f"Failed to initialize OpenAI client: {str(e)}")
-            print("Falling back to Azure OpenAI...")
-            
-            # Fall back to Azure OpenAI
-            try:
-                return openai.AzureOpenAI(
-                    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-                    api_version=os.getenv("AZURE_OPENAI_API_VERSION")
-                )
-            except Exception as azure_error:
-                print(f"Failed to initialize Azure OpenAI client: {str(azure_error)}")
-                raise Exception("Failed to initialize any OpenAI client. Please check your API keys and configurations.")
+        self.model = os.getenv("OPENAI_MODEL", "o4-mini-2025-04-16")
+        # Built once and reused on every bad-input path; do not mutate.
+        self._input_required_status = TaskStatus(
+            state=TaskState.INPUT_REQUIRED,
+            message={
+                "role": "agent",
+                "content": {
+                    "dataType": "data",
+                    "message": "Please provide required input parameters."
+                }
+            }
+        )
+
+    @cached_property
+    def client(self):
+        """Return the shared OpenAI client lazily on first use."""
+        return get_openai_client()
     
     def _call_api(self, inputs: Dict[str, Any]) -> str:
         """
@@ -55,9 +59,9 @@ class ProductDescriptionGeneratorAgent(A2AServer):
             str: API response content
         """
         try:
-            response = requests.post(self.url, json=inputs)
+            response = _http.session.post(self.url, json=inputs)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             return f"API call failed: {str(e)}"
     
@@ -76,7 +80,7 @@ class ProductDescriptionGeneratorAgent(A2AServer):
             prompt = f"Goal: {self.goal}\n\nInputs: {inputs}\n\nPlease process these inputs according to the goal."
             
             response = self.client.chat.completions.create(
-                model=os.getenv("OPENAI_MODEL", "o4-mini-2025-04-16"),
+                model=self.model,
                 messages=[
                     {"role": "system", "content": f"You are an AI agent with the following goal: {self.goal}"},
                     {"role": "user", "content": prompt}
@@ -100,7 +104,7 @@ class ProductDescriptionGeneratorAgent(A2AServer):
         """
         try:
             # Validate required inputs
-            kwargs = json.loads(kwargs["text"])
+            kwargs = orjson.loads(kwargs["text"])
             for required_input in ['product_name', 'features', 'category']:
                 if required_input not in kwargs:
                     raise ValueError(f"Missing required input: {required_input}")
@@ -122,22 +126,10 @@ class ProductDescriptionGeneratorAgent(A2AServer):
         content = message_data.get("content", {})
         
         # Handle different content formats
-        if isinstance(content, dict):
-            inputs = content
-        else:
-            inputs = {"raw_input": content}
+        inputs = extract_inputs(content)
         
         if not inputs:
-            task.status = TaskStatus(
-                state=TaskState.INPUT_REQUIRED,
-                message={
-                    "role": "agent",
-                    "content": {
-                        "dataType": "data",
-                        "message": "Please provide required input parameters."
-                    }
-                }
-            )
+            task.status = self._input_required_status
             return task
         
         # Process the input and make appropriate call
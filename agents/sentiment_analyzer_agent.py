@@ -1,10 +1,17 @@
 from python_a2a import A2AServer, skill, agent, TaskStatus, TaskState
 import os
 import requests
-import openai
-import json
+import orjson
 from typing import Dict, Any
 from dotenv import load_dotenv
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+from agents import _http
+from agents._taskutil import extract_inputs
+from agents.openai_client import get_openai_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,27 +29,19 @@ class SentimentAnalyzerAgent(A2AServer):
         self.goal = "Provide accurate sentiment analysis and emotional insights from text"
         self.tags = ['nlp', 'sentiment-analysis', 'emotion-detection']
         self.port = 5013
-        self.client = self._initialize_openai_client()
-    
-    def _initialize_openai_client(self):
-        """Initialize OpenAI client with fallback to Azure OpenAI."""
-        try:
-            # Try to initialize the default OpenAI client
-            return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        except Exception as e:
-            print(f"Failed to initialize OpenAI client: {str(e)}")
-            print("Falling back to Azure OpenAI...")
-            
-            # Fall back to Azure OpenAI
-            try:
-                return openai.AzureOpenAI(
-                    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-                    api_version=os.getenv("AZURE_OPENAI_API_VERSION")
-                )
-            except Exception as azure_error:
-                print(f"Failed to initialize Azure OpenAI client: {str(azure_error)}")
-                raise Exception("Failed to initialize any OpenAI client. Please check your API keys and configurations.")
+        # Shared, lazily created client; see agents/openai_client.py
+        self.client = get_openai_client()
+        # Built once and reused on every bad-input path; do not mutate.
+        self._input_required_status = TaskStatus(
+            state=TaskState.INPUT_REQUIRED,
+            message={
+                "role": "agent",
+                "content": {
+                    "dataType": "data",
+                    "message": "Please provide required input parameters."
+                }
+            }
+        )
     
     def _call_api(self, inputs: Dict[str, Any]) -> str:
         """
@@ -55,9 +54,9 @@ class SentimentAnalyzerAgent(A2AServer):
             str: API response content
         """
         try:
-            response = requests.post(self.url, json=inputs)
+            response = _http.session.post(self.url, json=inputs)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             return f"API call failed: {str(e)}"
     
@@ -100,7 +99,7 @@ class SentimentAnalyzerAgent(A2AServer):
         """
         try:
             # Validate required inputs
-            kwargs = json.loads(kwargs["text"])
+            kwargs = orjson.loads(kwargs["text"])
             for required_input in ['text']:
                 if required_input not in kwargs:
                     raise ValueError(f"Missing required input: {required_input}")
@@ -122,22 +121,10 @@ class SentimentAnalyzerAgent(A2AServer):
         content = message_data.get("content", {})
         
         # Handle different content formats
-        if isinstance(content, dict):
-            inputs = content
-        else:
-            inputs = {"raw_input": content}
+        inputs = extract_inputs(content)
         
         if not inputs:
-            task.status = TaskStatus(
-                state=TaskState.INPUT_REQUIRED,
-                message={
-                    "role": "agent",
-                    "content": {
-                        "dataType": "data",
-                        "message": "Please provide required input parameters."
-                    }
-                }
-            )
+            task.status = self._input_required_status
             return task
         
         # Process the input and make appropriate call
@@ -1,10 +1,20 @@
 from python_a2a import A2AServer, skill, agent, TaskStatus, TaskState
 import os
+import re
 import requests
-import openai
-import json
+import orjson
+from collections import Counter
 from typing import Dict, Any
 from dotenv import load_dotenv
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+from agents import _http
+from agents._taskutil import extract_inputs
+from agents import _llm_cache
+from agents.openai_client import get_openai_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,27 +32,19 @@ class SummarizerAgent(A2AServer):
         self.goal = "Create a concise summary of the given text"
         self.tags = ['summarization', 'text-summary', 'summary']
         self.port = 5015
-        self.client = self._initialize_openai_client()
-    
-    def _initialize_openai_client(self):
-        """Initialize OpenAI client with fallback to Azure OpenAI."""
-        try:
-            # Try to initialize the default OpenAI client
-            return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        except Exception as e:
-            print(f"Failed to initialize OpenAI client: {str(e)}")
-            print("Falling back to Azure OpenAI...")
-            
-            # Fall back to Azure OpenAI
-            try:
-                return openai.AzureOpenAI(
-                    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-                    api_version=os.getenv("AZURE_OPENAI_API_VERSION")
-                )
-            except Exception as azure_error:
-                print(f"Failed to initialize Azure OpenAI client: {str(azure_error)}")
-                raise Exception("Failed to initialize any OpenAI client. Please check your API keys and configurations.")
+        # Shared, lazily created client; see agents/openai_client.py
+        self.client = get_openai_client()
+        # Built once and reused on every bad-input path; do not mutate.
+        self._input_required_status = TaskStatus(
+            state=TaskState.INPUT_REQUIRED,
+            message={
+                "role": "agent",
+                "content": {
+                    "dataType": "data",
+                    "message": "Please provide required input parameters."
+                }
+            }
+        )
     
     def _call_api(self, inputs: Dict[str, Any]) -> str:
         """
@@ -55,12 +57,36 @@ class SummarizerAgent(A2AServer):
             str: API response content
         """
         try:
-            response = requests.post(self.url, json=inputs)
+            response = _http.session.post(self.url, json=inputs)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             return f"API call failed: {str(e)}"
     
+    def _local_summarize(self, text: str, max_sentences: int = 3) -> str:
+        """
+        Summarize short text locally with a frequency-based extractive pass.
+
+        Args:
+            text: The text to summarize
+            max_sentences: Maximum number of sentences in the summary
+
+        Returns:
+            str: The top-scoring sentences in their original order
+        """
+        sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+        if len(sentences) <= max_sentences:
+            return text.strip()
+
+        # Score sentences by the frequency of their significant words
+        word_freq = Counter(w for w in re.findall(r"[a-z']+", text.lower()) if len(w) > 3)
+        scores = [
+            sum(word_freq.get(w, 0) for w in re.findall(r"[a-z']+", sentence.lower()))
+            for sentence in sentences
+        ]
+        top = sorted(sorted(range(len(sentences)), key=scores.__getitem__, reverse=True)[:max_sentences])
+        return " ".join(sentences[i] for i in top)
+
     def _call_llm(self, inputs: Dict[str, Any]) -> str:
         """
         Make LLM call using OpenAI API.
@@ -72,9 +98,15 @@ class SummarizerAgent(A2AServer):
             str: LLM response content
         """
         try:
+            # Return a cached summary when the same inputs were seen before
+            cache_key = _llm_cache.make_key(self.goal, inputs)
+            cached = _llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             # Create a prompt based on the agent's goal and inputs
             prompt = f"Goal: {self.goal}\n\nInputs: {inputs}\n\nPlease process these inputs according to the goal."
-            
+
             response = self.client.chat.completions.create(
                 model=os.getenv("OPENAI_MODEL", "o4-mini-2025-04-16"),
                 messages=[
@@ -82,7 +114,9 @@ class SummarizerAgent(A2AServer):
                     {"role": "user", "content": prompt}
                 ]
             )
-            return response.choices[0].message.content
+            result = response.choices[0].message.content
+            _llm_cache.put(cache_key, result)
+            return result
         except Exception as e:
             return f"LLM call failed: {str(e)}"
     
@@ -100,7 +134,7 @@ class SummarizerAgent(A2AServer):
         """
         try:
             # Validate required inputs
-            kwargs = json.loads(kwargs["text"])
+            kwargs = orjson.loads(kwargs["text"])
             for required_input in ['text']:
                 if required_input not in kwargs:
                     raise ValueError(f"Missing required input: {required_input}")
@@ -108,6 +142,9 @@ class SummarizerAgent(A2AServer):
             # Choose between API call and LLM call based on URL availability
             if self.url != "None":
                 result = self._call_api(kwargs)
+            elif len(kwargs["text"].split()) < 200:
+                # Short inputs are summarized locally, skipping the OpenAI hop
+                result = self._local_summarize(kwargs["text"])
             else:
                 result = self._call_llm(kwargs)
             
@@ -122,22 +159,10 @@ class SummarizerAgent(A2AServer):
         content = message_data.get("content", {})
         
         # Handle different content formats
-        if isinstance(content, dict):
-            inputs = content
-        else:
-            inputs = {"raw_input": content}
+        inputs = extract_inputs(content)
         
         if not inputs:
-            task.status = TaskStatus(
-                state=TaskState.INPUT_REQUIRED,
-                message={
-                    "role": "agent",
-                    "content": {
-                        "dataType": "data",
-                        "message": "Please provide required input parameters."
-                    }
-                }
-            )
+            task.status = self._input_required_status
             return task
         
         # Process the input and make appropriate call
@@ -1,25 +1,52 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends, Response
+from fastapi.responses import ORJSONResponse
 from typing import Optional, Dict, Any
 from uuid import UUID
+import asyncio
 import uvicorn
+from python_a2a import Message, TextContent, MessageRole
 from runnable_config import SessionConfig
 import os
 from pathlib import Path
+from functools import lru_cache
 import shutil
 import json
 
-app = FastAPI(title="Session Management API")
+# orjson handles UUID/datetime natively and is far faster than the
+# stdlib encoder on the nested session payloads
+app = FastAPI(title="Session Management API", default_response_class=ORJSONResponse)
 
 # Initialize SessionConfig
 session_config = SessionConfig()
 
-async def get_session_id(x_session_id: str = Header(..., description="Session ID in UUID format")) -> UUID:
-    """Validate and return session ID from header."""
+@app.on_event("shutdown")
+async def flush_buffered_writes():
+    # Conversation messages are buffered in memory between flushes;
+    # without this a clean shutdown drops up to a batch per session
+    session_config.flush_all()
+
+# Resolved once instead of per request in add_message
+_ROLE_USER = MessageRole.USER
+_ROLE_AGENT = MessageRole.AGENT
+
+@lru_cache(maxsize=1024)
+def _parse_session_id(x_session_id: str) -> Optional[UUID]:
+    """Parse a session ID header value, or None if malformed.
+
+    UUID() does full validation work on every call; clients resend the
+    same session ID on every request, so the parse is memoized.
+    """
     try:
         return UUID(x_session_id)
     except ValueError:
+        return None
+
+async def get_session_id(x_session_id: str = Header(..., description="Session ID in UUID format")) -> UUID:
+    """Validate and return session ID from header."""
+    session_id = _parse_session_id(x_session_id)
+    if session_id is None:
         raise HTTPException(status_code=400, detail="Invalid session ID format")
+    return session_id
 
 @app.post("/upload")
 async def upload_file(
@@ -30,37 +57,20 @@ async def upload_file(
     try:
         # Create session if it doesn't exist
         session_config.create_session(session_id)
-        
-        # Create temporary file
-        temp_dir = Path("temp_uploads")
-        temp_dir.mkdir(exist_ok=True)
-        temp_path = temp_dir / file.filename
-        
-        try:
-            # Save uploaded file temporarily
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Process the file
-            result = session_config.process_file(session_id, str(temp_path))
-            
-            # Add file to session configuration
-            session_config.add_file_path(session_id, str(temp_path), file.filename.split(".")[-1])
-            
-            return {
-                "status": "success",
-                "message": "File processed successfully",
-                "session_id": str(session_id),
-                "file_info": result
-            }
-            
-        finally:
-            # Clean up temporary file
-            if temp_path.exists():
-                temp_path.unlink()
-            if temp_dir.exists() and not any(temp_dir.iterdir()):
-                temp_dir.rmdir()
-                
+
+        # Read the upload once and hand the bytes straight to the
+        # processors; process_bytes persists them into the session
+        # directory itself, so the temp-file write/read/delete is gone
+        data = await file.read()
+        result = await asyncio.to_thread(session_config.process_bytes, session_id, data, file.filename)
+
+        return {
+            "status": "success",
+            "message": "File processed successfully",
+            "session_id": str(session_id),
+            "file_info": result
+        }
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -82,19 +92,48 @@ async def get_session_info(session_id: UUID) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+def _dataframe_to_arrow(df) -> bytes:
+    """Serialize a DataFrame to Arrow IPC stream bytes."""
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
 @app.get("/session/{session_id}/dataframe/{name}")
-async def get_dataframe(session_id: UUID, name: str) -> Dict[str, Any]:
-    """Get a specific DataFrame from the session."""
+async def get_dataframe(session_id: UUID, name: str, accept: Optional[str] = Header(None)):
+    """Get a specific DataFrame from the session.
+
+    Clients that accept the Arrow stream media type get the frame as
+    columnar Arrow IPC bytes, skipping the per-row dict conversion and
+    JSON encoding entirely; everyone else gets the JSON records shape.
+    """
     try:
         df = session_config.get_dataframe(session_id, name)
         if df is None:
             raise HTTPException(status_code=404, detail="DataFrame not found")
-            
+
         description = session_config.get_dataframe_description(session_id, name)
-        
+
+        if accept and ARROW_MEDIA_TYPE in accept:
+            try:
+                body = await asyncio.to_thread(_dataframe_to_arrow, df)
+                return Response(content=body, media_type=ARROW_MEDIA_TYPE)
+            except ImportError:
+                # pyarrow not installed; fall through to the JSON shape
+                pass
+
+        # Row-dict conversion of a large frame is CPU-bound; keep it off
+        # the event loop
+        data = await asyncio.to_thread(df.to_dict, orient="records")
+
         return {
             "name": name,
-            "data": df.to_dict(orient="records"),
+            "data": data,
             "columns": df.columns.tolist(),
             "description": description
         }
@@ -105,10 +144,12 @@ async def get_dataframe(session_id: UUID, name: str) -> Dict[str, Any]:
 async def get_conversation(session_id: UUID) -> Dict[str, Any]:
     """Get the conversation history for a session."""
     try:
-        history = session_config.get_conversation_history(session_id)
+        # The stored dicts already carry role and content, so no Message
+        # objects are built just to unpack them again
+        history = session_config.get_conversation_messages(session_id)
         return {
             "session_id": str(session_id),
-            "messages": [{"role": msg.role.value, "content": msg.content.text} for msg in history]
+            "messages": [{"role": msg["role"], "content": msg["content"]} for msg in history]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -120,12 +161,10 @@ async def add_message(
 ) -> Dict[str, Any]:
     """Add a message to the session conversation."""
     try:
-        from python_a2a import Message, TextContent, MessageRole
-        
         # Create Message object
         msg = Message(
             content=TextContent(text=message["content"]),
-            role=MessageRole.USER if message["role"] == "user" else MessageRole.AGENT
+            role=_ROLE_USER if message["role"] == "user" else _ROLE_AGENT
         )
         
         # Add message to session
@@ -155,4 +194,16 @@ async def delete_session(session_id: UUID) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # uvloop + httptools cut event-loop and HTTP parsing overhead.
+    # Workers default to 1: conversation writes are buffered in process
+    # memory and config.json updates are serialized with an in-process
+    # lock, so multiple workers would lose each other's writes. Scale
+    # via API_WORKERS only once the session store is multi-process safe.
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("API_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+    )
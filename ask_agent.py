@@ -1,16 +1,30 @@
 from dotenv import load_dotenv
 from python_a2a import AgentNetwork, AIAgentRouter, Message, Conversation, MessageRole, TextContent, A2AClient
 import openai
+import orjson
 import os
 import time
 import requests
-import json
 import subprocess
 import sys
+from functools import lru_cache
+from pathlib import Path
+
+# Enum members are singletons, so identity checks in the summary loop
+# skip the Enum __eq__ machinery
+_USER = MessageRole.USER
+_AGENT = MessageRole.AGENT
+
+_AGENT_CONFIG_PATH = 'agents/config.json'
+
+@lru_cache(maxsize=4)
+def _load_agent_config(path, mtime):
+    return orjson.loads(Path(path).read_bytes())
 
 def load_agent_config():
-    with open('agents/config.json', 'r') as f:
-        return json.load(f)
+    # Keyed on the file's mtime: unchanged config is a cache hit with
+    # no parse, while edits are picked up without a restart
+    return _load_agent_config(_AGENT_CONFIG_PATH, os.path.getmtime(_AGENT_CONFIG_PATH))
 
 def display_available_agents(config):
     print("\nAvailable Agents:")
@@ -20,6 +34,17 @@ def display_available_agents(config):
         print(f"   Skills: {', '.join(skill['name'] for skill in agent['skills'])}")
         print()
 
+# One A2AClient per agent URL, created on first use. A2AClient wraps a
+# requests.Session, so reusing it keeps the underlying connection alive
+# instead of handshaking on every send.
+_agent_clients = {}
+
+def get_agent_client(agent_url):
+    client = _agent_clients.get(agent_url)
+    if client is None:
+        client = _agent_clients.setdefault(agent_url, A2AClient(agent_url))
+    return client
+
 def get_agent_url(port, agent_file):
     # Construct the path to the agent file
     # agent_path = os.path.join('agents', agent_file)
@@ -48,86 +73,75 @@ def get_agent_url(port, agent_file):
     #     raise Exception(f"Failed to start agent: {str(e)}")
     return f"http://localhost:{port}"
 
+# Choice menus for the special input parameters. Each entry holds the
+# prompt lines, the option-number-to-value map, and the default used
+# for unrecognized choices; built once instead of per prompt.
+CHOICE_PROMPTS = {
+    'target_language': (
+        "\nAvailable languages:\n"
+        "1. Spanish\n2. French\n3. German\n4. Italian\n5. Portuguese\n"
+        "6. Chinese\n7. Japanese\n8. Korean\n9. Russian\n10. Arabic",
+        "Select target language (1-10): ",
+        {
+            "1": "Spanish", "2": "French", "3": "German", "4": "Italian",
+            "5": "Portuguese", "6": "Chinese", "7": "Japanese", "8": "Korean",
+            "9": "Russian", "10": "Arabic"
+        },
+        "English"
+    ),
+    'analysis_type': (
+        "\nAvailable analysis types:\n"
+        "1. Sentiment Analysis\n2. Topic Analysis\n"
+        "3. Keyword Extraction\n4. Entity Recognition",
+        "Select analysis type (1-4): ",
+        {"1": "sentiment", "2": "topic", "3": "keywords", "4": "entities"},
+        "sentiment"
+    ),
+    'chart_type': (
+        "\nAvailable chart types:\n"
+        "1. Bar Chart\n2. Line Chart\n3. Pie Chart\n"
+        "4. Scatter Plot\n5. Heat Map",
+        "Select chart type (1-5): ",
+        {"1": "bar", "2": "line", "3": "pie", "4": "scatter", "5": "heatmap"},
+        "bar"
+    ),
+    'query_type': (
+        "\nAvailable query types:\n"
+        "1. SELECT\n2. INSERT\n3. UPDATE\n4. DELETE",
+        "Select query type (1-4): ",
+        {"1": "select", "2": "insert", "3": "update", "4": "delete"},
+        "select"
+    ),
+}
+
 def collect_agent_inputs(agent):
     """Collect all required inputs for the selected agent based on its configuration."""
     inputs = {}
-    
+
     # Get all skills and their required inputs
     for skill in agent['skills']:
         print(f"\nCollecting inputs for skill: {skill['name']}")
         print(f"Description: {skill['description']}")
-        
+
         for input_param in skill['inputs']:
             # Handle special cases for certain input types
-            if input_param == 'target_language':
-                print("\nAvailable languages:")
-                print("1. Spanish")
-                print("2. French")
-                print("3. German")
-                print("4. Italian")
-                print("5. Portuguese")
-                print("6. Chinese")
-                print("7. Japanese")
-                print("8. Korean")
-                print("9. Russian")
-                print("10. Arabic")
-                lang_choice = input(f"Select target language (1-10): ")
-                lang_map = {
-                    "1": "Spanish", "2": "French", "3": "German", "4": "Italian",
-                    "5": "Portuguese", "6": "Chinese", "7": "Japanese", "8": "Korean",
-                    "9": "Russian", "10": "Arabic"
-                }
-                inputs[input_param] = lang_map.get(lang_choice, "English")
-            
-            elif input_param == 'analysis_type':
-                print("\nAvailable analysis types:")
-                print("1. Sentiment Analysis")
-                print("2. Topic Analysis")
-                print("3. Keyword Extraction")
-                print("4. Entity Recognition")
-                analysis_choice = input(f"Select analysis type (1-4): ")
-                analysis_map = {
-                    "1": "sentiment", "2": "topic", "3": "keywords", "4": "entities"
-                }
-                inputs[input_param] = analysis_map.get(analysis_choice, "sentiment")
-            
-            elif input_param == 'chart_type':
-                print("\nAvailable chart types:")
-                print("1. Bar Chart")
-                print("2. Line Chart")
-                print("3. Pie Chart")
-                print("4. Scatter Plot")
-                print("5. Heat Map")
-                chart_choice = input(f"Select chart type (1-5): ")
-                chart_map = {
-                    "1": "bar", "2": "line", "3": "pie", "4": "scatter", "5": "heatmap"
-                }
-                inputs[input_param] = chart_map.get(chart_choice, "bar")
-            
-            elif input_param == 'query_type':
-                print("\nAvailable query types:")
-                print("1. SELECT")
-                print("2. INSERT")
-                print("3. UPDATE")
-                print("4. DELETE")
-                query_choice = input(f"Select query type (1-4): ")
-                query_map = {
-                    "1": "select", "2": "insert", "3": "update", "4": "delete"
-                }
-                inputs[input_param] = query_map.get(query_choice, "select")
-            
+            choice_prompt = CHOICE_PROMPTS.get(input_param)
+            if choice_prompt:
+                menu, prompt, value_map, default = choice_prompt
+                print(menu)
+                choice = input(prompt)
+                inputs[input_param] = value_map.get(choice, default)
             else:
                 # For other input parameters, just ask for text input
                 value = input(f"Enter {input_param}: ")
                 inputs[input_param] = value
-    
+
     return inputs
 
 def format_inputs_for_agent(inputs):
     """Format the collected inputs into a structured message for the agent."""
-    # Convert inputs to a JSON-like string format
-    formatted_inputs = json.dumps(inputs, indent=2)
-    return formatted_inputs
+    # Compact orjson output; the agents parse this, nobody reads it
+    return orjson.dumps(inputs).decode()
 
 def main():
     # Load agent configuration
@@ -151,7 +165,7 @@ def main():
     try:
         # Create client for selected agent
         agent_url = get_agent_url(selected_agent['port'], selected_agent['file'])
-        client = A2AClient(agent_url)
+        client = get_agent_client(agent_url)
         
         print(f"\nConnected to {selected_agent['name']} on port {selected_agent['port']}")
         
@@ -185,8 +199,10 @@ def main():
             # Calculate elapsed time
             elapsed_time = time.time() - start_time
             
-            # Clear the "thinking" indicator
-            print("\r" + " " * 30 + "\r", end="", flush=True)
+            # Clear the "thinking" indicator with one erase-line escape
+            # instead of painting 30 spaces
+            sys.stdout.write("\x1b[2K\r")
+            sys.stdout.flush()
             
             # Extract the latest response
             latest_response = conversation.messages[-1]
@@ -195,8 +211,10 @@ def main():
             print(f"Agent ({elapsed_time:.2f}s): {latest_response.content.text}\n")
 
         except Exception as e:
-            # Clear the "thinking" indicator
-            print("\r" + " " * 30 + "\r", end="", flush=True)
+            # Clear the "thinking" indicator with one erase-line escape
+            # instead of painting 30 spaces
+            sys.stdout.write("\x1b[2K\r")
+            sys.stdout.flush()
             
             print(f"\n❌ Error: {e}")
             print("Try sending a different message.\n")
@@ -206,14 +224,24 @@ def main():
         print("Failed to start the agent. Please try again.")
         return
 
-    # Print the full conversation summary at the end
-    print("=================================================================")
-    print(conversation)
-    message_count = len(conversation.messages)
-    print(f"\n=== Conversation Summary ===")
-    print(f"Total messages: {message_count}")
-    print(f"User messages: {sum(1 for m in conversation.messages if m.role == MessageRole.USER)}")
-    print(f"Assistant messages: {sum(1 for m in conversation.messages if m.role == MessageRole.AGENT)}")
+    # Count roles in a single pass over the conversation
+    user_messages = agent_messages = 0
+    for m in conversation.messages:
+        if m.role is _USER:
+            user_messages += 1
+        elif m.role is _AGENT:
+            agent_messages += 1
+
+    # Print the full conversation summary at the end as one write
+    # instead of a sequence of prints
+    sys.stdout.write(
+        "=================================================================\n"
+        f"{conversation}\n"
+        "\n=== Conversation Summary ===\n"
+        f"Total messages: {len(conversation.messages)}\n"
+        f"User messages: {user_messages}\n"
+        f"Assistant messages: {agent_messages}\n"
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
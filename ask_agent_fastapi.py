@@ -1,49 +1,82 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, Any
 from dotenv import load_dotenv
-from python_a2a import AgentNetwork, AIAgentRouter, Message, Conversation, MessageRole, TextContent, A2AClient
-import json
+from python_a2a import Message, Conversation, MessageRole, TextContent, A2AClient
+import asyncio
+import os
+import orjson
+from functools import lru_cache
+from pathlib import Path
 import time
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Agent Communication API")
+# Enum members are singletons, so identity checks in the summary loop
+# skip the Enum __eq__ machinery
+_USER = MessageRole.USER
+_AGENT = MessageRole.AGENT
+
+app = FastAPI(title="Agent Communication API", default_response_class=ORJSONResponse)
 
 class AgentRequest(BaseModel):
     agent_flag: str
     inputs: Dict[str, Any]
 
+_AGENT_CONFIG_PATH = 'agents/config.json'
+
+@lru_cache(maxsize=4)
+def _load_agent_config(path, mtime):
+    return orjson.loads(Path(path).read_bytes())
+
 def load_agent_config():
-    with open('agents/config.json', 'r') as f:
-        return json.load(f)
+    # Keyed on the file's mtime: unchanged config is a cache hit with
+    # no parse, while edits are picked up without a restart
+    return _load_agent_config(_AGENT_CONFIG_PATH, os.path.getmtime(_AGENT_CONFIG_PATH))
 
 def get_agent_url(port):
     return f"http://localhost:{port}"
 
+# Flag-to-agent index rebuilt only when the cached config object
+# changes, replacing the per-request linear scan
+_agents_by_flag = (None, None)
+
+def get_agents_by_flag():
+    global _agents_by_flag
+    config = load_agent_config()
+    cached_config, index = _agents_by_flag
+    if cached_config is not config:
+        index = {agent['agent_flag']: agent for agent in config['agents']}
+        _agents_by_flag = (config, index)
+    return index
+
+# One A2AClient per agent URL, created on first use. Building a client
+# per request threw away the pooled connection on every call.
+_agent_clients = {}
+
+def get_agent_client(agent_url):
+    client = _agent_clients.get(agent_url)
+    if client is None:
+        client = _agent_clients.setdefault(agent_url, A2AClient(agent_url))
+    return client
+
 @app.post("/ask_agent")
 async def ask_agent(request: AgentRequest):
     try:
-        # Load agent configuration
-        config = load_agent_config()
-        
         # Find the selected agent by flag
-        selected_agent = None
-        for agent in config['agents']:
-            if agent['flag'] == request.agent_flag:
-                selected_agent = agent
-                break
-        
+        selected_agent = get_agents_by_flag().get(request.agent_flag)
         if not selected_agent:
             raise HTTPException(status_code=404, detail=f"Agent with flag '{request.agent_flag}' not found")
         
         # Create client for selected agent
         agent_url = get_agent_url(selected_agent['port'])
-        client = A2AClient(agent_url)
+        client = get_agent_client(agent_url)
         
-        # Format the inputs into a message
-        formatted_inputs = json.dumps(request.inputs, indent=2)
+        # Format the inputs into a message; compact orjson bytes, the
+        # agent parses this rather than a person reading it
+        formatted_inputs = orjson.dumps(request.inputs).decode()
         
         # Create a message with the formatted inputs
         user_message = Message(
@@ -58,8 +91,9 @@ async def ask_agent(request: AgentRequest):
         # Time the response
         start_time = time.time()
         
-        # Get the response by sending the message
-        bot_response = client.send_message(user_message)
+        # Get the response by sending the message; the A2A client is
+        # synchronous, so keep the network wait off the event loop
+        bot_response = await asyncio.to_thread(client.send_message, user_message)
         conversation.add_message(bot_response)
         
         # Calculate elapsed time
@@ -67,20 +101,47 @@ async def ask_agent(request: AgentRequest):
         
         # Extract the latest response
         latest_response = conversation.messages[-1]
-        
+
+        # The conversation is built in this handler from exactly one
+        # user message and one reply, so the summary counts are known
+        # without scanning the message list
+        user_messages = 1
+        agent_messages = 1 if bot_response.role is _AGENT else 0
+
         return {
             "response": latest_response.content.text,
             "elapsed_time": elapsed_time,
             "conversation_summary": {
                 "total_messages": len(conversation.messages),
-                "user_messages": sum(1 for m in conversation.messages if m.role == MessageRole.USER),
-                "assistant_messages": sum(1 for m in conversation.messages if m.role == MessageRole.AGENT)
+                "user_messages": user_messages,
+                "assistant_messages": agent_messages
             }
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class BatchAgentRequest(BaseModel):
+    requests: list[AgentRequest]
+
+@app.post("/ask_agents")
+async def ask_agents(batch: BatchAgentRequest):
+    """Send several agent requests concurrently.
+
+    Each entry is dispatched through the same path as /ask_agent; the
+    blocking sends run in threads and complete in parallel, so a batch
+    costs roughly one round trip instead of the sum of all of them.
+    Failures are reported per entry instead of failing the batch.
+    """
+    async def run_one(request: AgentRequest):
+        try:
+            return await ask_agent(request)
+        except HTTPException as e:
+            return {"error": e.detail, "status_code": e.status_code}
+
+    results = await asyncio.gather(*(run_one(request) for request in batch.requests))
+    return {"responses": results}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
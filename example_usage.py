@@ -1,15 +1,19 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends, Query
-from fastapi.responses import JSONResponse
-from python_a2a import AgentNetwork, AIAgentRouter, Message, Conversation, MessageRole, TextContent, A2AClient
-from typing import Dict, Any
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
+from python_a2a import Message, MessageRole, TextContent, A2AClient
+from typing import Dict, Any, List
 from uuid import UUID
 import uvicorn
-import json
+import aiofiles
+import os
+from collections import OrderedDict
+import time
+import asyncio
+import orjson
+from functools import lru_cache
 from session_manager import SessionManager
 from pathlib import Path
 import shutil
-from python_a2a import Message, MessageRole, TextContent
-from langchain_experimental.agents import create_pandas_dataframe_agent
 from langchain_openai import ChatOpenAI
 from contextlib import asynccontextmanager
 from pydantic import BaseModel
@@ -20,7 +24,8 @@ session_manager = SessionManager()
 async def lifespan(app: FastAPI):
     # Startup: Initialize any resources if needed
     yield
-    # Shutdown: Clean up resources
+    # Shutdown: flush buffered conversation writes, then clean up
+    session_manager.flush_all()
     session_manager.cleanup_all()
     if Path("temp_storage").exists():
         # remove folders in the temp_storage folder
@@ -31,7 +36,8 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="Multi-Session Management API",
     description="API for managing multiple sessions with file upload and information retrieval",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 async def get_session_id(x_session_id: str = Header(..., description="Session ID in UUID format")) -> UUID:
@@ -46,33 +52,134 @@ class AgentRequest(BaseModel):
     agent_flag: str
     inputs: Dict[str, Any]
 
+_AGENT_CONFIG_PATH = 'agents/config.json'
+
+@lru_cache(maxsize=4)
+def _load_agent_config(path, mtime):
+    return orjson.loads(Path(path).read_bytes())
+
 def load_agent_config():
-    with open('agents/config.json', 'r') as f:
-        return json.load(f)
+    # Keyed on the file's mtime: unchanged config is a cache hit with
+    # no parse, while edits are picked up without a restart
+    return _load_agent_config(_AGENT_CONFIG_PATH, os.path.getmtime(_AGENT_CONFIG_PATH))
 
 
 def get_agent_url(port):
     return f"http://localhost:{port}"
 
 
+# Static text of the file-routing prompt, built once; per request only
+# the two inputs are formatted in
+ROUTING_PROMPT_TEMPLATE = """You are an intelligent assistant that decides whether a file is needed to answer a user's question based on the conversation history and uploaded file descriptions.
+
+                Inputs:
+                - conversation history: {conversation_history}
+                - file descriptions: {file_descriptions}
+
+                Instruction:
+                1. First, determine if the user's question can be answered **without referring to any files**. If the user's input provides all necessary information (e.g., simple summarization, counting words, or evaluating a known phrase), then return `None`.
+                2. If a file is needed, select the **most recently uploaded file** that is **relevant** to the user's question based on the file descriptions and context.
+                3. Only return the **name of the relevant file or `None`**. Do not include any other text or explanation.
+                4. Be strict — only select a file if it is clearly required to perform the task.
+
+                Return:
+                - Just the name of the file (e.g., `document1`) or `None`.
+                """
+
+
+# Routing decisions cached by (message, file descriptions) with a TTL:
+# the same question over the same files routes identically, but entries
+# expire so newly uploaded files are reconsidered.
+_ROUTING_CACHE_MAX = 1024
+_ROUTING_CACHE_TTL = 300  # seconds
+_routing_cache = OrderedDict()
+
+
+def _routing_cache_get(key):
+    entry = _routing_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, file_name = entry
+    if expires_at < time.monotonic():
+        del _routing_cache[key]
+        return None
+    _routing_cache.move_to_end(key)
+    return file_name
+
+
+def _routing_cache_put(key, file_name):
+    _routing_cache[key] = (time.monotonic() + _ROUTING_CACHE_TTL, file_name)
+    _routing_cache.move_to_end(key)
+    if len(_routing_cache) > _ROUTING_CACHE_MAX:
+        _routing_cache.popitem(last=False)
+
+
+# Exact-match cache of full agent replies, keyed by session, agent,
+# message, and the session's file state: a repeated question over
+# unchanged files skips both routing and the agent round trip. Entries
+# expire so answers do not outlive the state they were computed from.
+_RESPONSE_CACHE_MAX = 256
+_RESPONSE_CACHE_TTL = 300  # seconds
+_response_cache = OrderedDict()
+
+
+def _response_cache_get(key):
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, reply = entry
+    if expires_at < time.monotonic():
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return reply
+
+
+def _response_cache_put(key, reply):
+    _response_cache[key] = (time.monotonic() + _RESPONSE_CACHE_TTL, reply)
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > _RESPONSE_CACHE_MAX:
+        _response_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def get_routing_llm():
+    # One ChatOpenAI client for the file-routing decision; constructing
+    # it per request redid credential setup and HTTP pool creation
+    return ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
+
+
+# One A2AClient per agent URL, created on first use. Building a client
+# per request threw away the pooled connection on every call.
+_agent_clients = {}
+
+
+def get_agent_client(agent_url):
+    client = _agent_clients.get(agent_url)
+    if client is None:
+        client = _agent_clients.setdefault(agent_url, A2AClient(agent_url))
+    return client
+
+
 def create_agent_inputs(message, session_id, conversation_history, file_name, file_data=None, file_type=None):
     """Collect all required inputs for the selected agent based on its configuration."""
     inputs = {}
     inputs["text"] = message
-    inputs["session_id"] = str(session_id)
-    conversation = []
-    for each in conversation_history:
-        if each.role == MessageRole.USER:
-            conversation.append({"role": "user", "content": each.content.text})
-        elif each.role == MessageRole.AGENT:
-            conversation.append({"role": "agent", "content": each.content.text})
-    inputs["conversation_history"] = conversation
+    # orjson serializes UUIDs natively, so no str() round trip is needed
+    inputs["session_id"] = session_id
+    # History arrives as the stored dicts, so it is projected straight
+    # through without rebuilding Message objects
+    inputs["conversation_history"] = [
+        {"role": each["role"], "content": each["content"]}
+        for each in conversation_history
+    ]
     inputs["file_name"] = file_name
     if file_data:
         inputs["file_data"] = file_data
     if file_type:
         inputs["file_type"] = file_type
-    return json.dumps(inputs, indent=2)
+    # Compact orjson bytes; the agent parses this, nobody reads it
+    return orjson.dumps(inputs).decode()
 
 
 def display_available_agents(config):
@@ -83,6 +190,20 @@ def display_available_agents(config):
     return output
 
 
+# Flag-to-agent index rebuilt only when the cached config object
+# changes, replacing the per-request scan-plus-index lookup
+_agents_by_flag = (None, None)
+
+def get_agents_by_flag():
+    global _agents_by_flag
+    config = load_agent_config()
+    cached_config, index = _agents_by_flag
+    if cached_config is not config:
+        index = {agent['agent_flag']: agent for agent in config['agents']}
+        _agents_by_flag = (config, index)
+    return index
+
+
 @app.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
@@ -100,40 +221,69 @@ async def upload_file(
     try:
         # Get or create session
         session_config = session_manager.create_session(session_id)
-        
-        # Create temporary file
-        temp_dir = Path("temp_storage")
-        temp_dir.mkdir(exist_ok=True)
-        temp_path = temp_dir / file.filename
-        
-        try:
-            # Save uploaded file temporarily
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Process the file
-            result = session_config.process_file(session_id, str(temp_path))
-            
-            return {
-                "status": "success",
-                "message": "File processed successfully",
-                "session_id": str(session_id),
-                "file_info": result
-            }
-            
-        finally:
-            # Clean up temporary file
-            if temp_path.exists():
-                temp_path.unlink()
-            if temp_dir.exists() and not any(temp_dir.iterdir()):
-                temp_dir.rmdir()
-                
+
+        # Stream the upload straight into the session directory; the
+        # temp_storage hop wrote and deleted an extra copy of every file
+        file_path = session_config.get_session_dir(session_id) / file.filename
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(1024 * 1024):
+                await buffer.write(chunk)
+
+        # Process the file off the event loop; PDF/CSV parsing is
+        # CPU-and-disk work that would otherwise stall other requests
+        result = await asyncio.to_thread(session_config.process_file, session_id, str(file_path))
+
+        return {
+            "status": "success",
+            "message": "File processed successfully",
+            "session_id": session_id,
+            "file_info": result
+        }
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/upload_batch")
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    session_id: UUID = Depends(get_session_id)
+) -> Dict[str, Any]:
+    """Upload and process several files concurrently.
+
+    Each file goes through the same streaming-and-process path as
+    /upload; a semaphore keeps the number of simultaneous parses
+    bounded, and failures are reported per file instead of failing
+    the whole batch.
+    """
+    session_config = session_manager.create_session(session_id)
+    semaphore = asyncio.Semaphore(8)
+
+    async def process_one(file: UploadFile) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                file_path = session_config.get_session_dir(session_id) / file.filename
+                async with aiofiles.open(file_path, "wb") as buffer:
+                    while chunk := await file.read(1024 * 1024):
+                        await buffer.write(chunk)
+                result = await asyncio.to_thread(session_config.process_file, session_id, str(file_path))
+                return {"filename": file.filename, "status": "success", "file_info": result}
+            except Exception as e:
+                return {"filename": file.filename, "status": "error", "detail": str(e)}
+
+    results = await asyncio.gather(*(process_one(file) for file in files))
+    return {"session_id": session_id, "files": results}
+
+
+# Serialized session-info payloads keyed by session; an entry is valid
+# only while the session's last_updated matches, so any write makes the
+# next read rebuild it
+_SESSION_INFO_CACHE_MAX = 1024
+_session_info_cache = OrderedDict()
+
+
 @app.get("/session/{session_id}")
-async def get_session_info(session_id: UUID) -> Dict[str, Any]:
+async def get_session_info(session_id: UUID):
     """Get complete session information.
     
     Args:
@@ -147,37 +297,52 @@ async def get_session_info(session_id: UUID) -> Dict[str, Any]:
         - Conversation history
     """
     try:
-        session_config = session_manager.get_session(session_id)
-        if not session_config:
+        # Single manager lookup for both the config and its data
+        found = session_manager.get_with_data(session_id)
+        if found is None:
             raise HTTPException(status_code=404, detail="Session not found")
-            
-        session = session_config.get_session(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session data not found")
-            
-        # Get DataFrame descriptions
+        session_config, session = found
+
+        # Serve the pre-serialized payload while the session is unchanged
+        cached = _session_info_cache.get(session_id)
+        if cached is not None and cached[0] == session["last_updated"]:
+            _session_info_cache.move_to_end(session_id)
+            return Response(content=cached[1], media_type="application/json")
+
+        # DataFrame schema comes from the metadata recorded when each
+        # frame was registered, so the CSVs are never loaded here
         dataframes = {}
-        for df_name in session.get("dataframes", {}):
-            df = session_config.get_dataframe(session_id, df_name)
-            description = session_config.get_dataframe_description(session_id, df_name)
-            if df is not None:
-                dataframes[df_name] = {
-                    "columns": df.columns.tolist(),
-                    "shape": df.shape,
-                    "description": description
-                }
+        for df_name, df_info in session.get("dataframes", {}).items():
+            meta = df_info.get("meta")
+            if meta is None:
+                # Sessions written before metadata was recorded fall
+                # back to loading the frame once
+                df = session_config.get_dataframe(session_id, df_name)
+                if df is None:
+                    continue
+                meta = {"columns": df.columns.tolist(), "shape": list(df.shape)}
+            dataframes[df_name] = {
+                "columns": meta["columns"],
+                "shape": meta["shape"],
+                "description": df_info.get("description")
+            }
         
         # Get conversation history
         conversation = session.get("conversation", {})
         
-        return {
-            "session_id": str(session_id),
+        body = orjson.dumps({
+            "session_id": session_id,
             "created_at": session["created_at"],
             "last_updated": session["last_updated"],
             "files": session["files"],
             "dataframes": dataframes,
             "conversation": conversation
-        }
+        })
+        _session_info_cache[session_id] = (session["last_updated"], body)
+        _session_info_cache.move_to_end(session_id)
+        if len(_session_info_cache) > _SESSION_INFO_CACHE_MAX:
+            _session_info_cache.popitem(last=False)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -195,16 +360,11 @@ async def list_sessions() -> Dict[str, Dict]:
 async def delete_session(session_id: UUID) -> Dict[str, Any]:
     """Delete a session and its associated data."""
     try:
-        session_config = session_manager.get_session(session_id)
-        if not session_config:
+        # Scoped removal: drops this session from the manager and
+        # deletes its data without touching any other live session
+        if not session_manager.delete_session(session_id):
             raise HTTPException(status_code=404, detail="Session not found")
-            
-        # Clean up session data
-        session_config.cleanup_all()
-        
-        # Remove session from manager
-        session_manager.cleanup_all()
-        
+
         return {
             "status": "success",
             "message": f"Session {session_id} deleted successfully"
@@ -242,55 +402,67 @@ async def ask_agent(
         if not session_config:
             raise HTTPException(status_code=404, detail="Session not found")
             
-        # Create user message
-        user_message = Message(
-            content=TextContent(text=message),
-            role=MessageRole.USER
+        # Record the raw user turn; the dict path avoids building a
+        # Message object just to persist it, and the disk-touching
+        # session calls run in threads like the other blocking work
+        await asyncio.to_thread(
+            session_config.add_conversation_message,
+            session_id, {"role": "user", "content": message}
         )
         
-        # Add user message to conversation history
-        session_config.add_conversation_message(session_id, user_message)
-        
         # TODO: Add actual agent processing logic here
         # For now, we'll just echo back a simple response
 
         # get the name of the dataframe based on the conversation history and the file_descriptions
-        llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
-        conversation_history = session_config.get_conversation_history(session_id)
-        session = session_config.get_session(session_id)
+        conversation_history = await asyncio.to_thread(session_config.get_conversation_messages, session_id)
+        session = await asyncio.to_thread(session_config.get_session, session_id)
         files = session.get("files", [])
         file_descriptions = {file_name: file_info["description"] for file_info in files for file_name, file_info in file_info.items() if file_info["description"]}
-        # get the name of the dataframe based on the conversation history and the file_descriptions
-        prompt = f"""You are an intelligent assistant that decides whether a file is needed to answer a user's question based on the conversation history and uploaded file descriptions.
-
-                Inputs:
-                - conversation history: {conversation_history}
-                - file descriptions: {file_descriptions}
-
-                Instruction:
-                1. First, determine if the user's question can be answered **without referring to any files**. If the user's input provides all necessary information (e.g., simple summarization, counting words, or evaluating a known phrase), then return `None`.
-                2. If a file is needed, select the **most recently uploaded file** that is **relevant** to the user's question based on the file descriptions and context.
-                3. Only return the **name of the relevant file or `None`**. Do not include any other text or explanation.
-                4. Be strict — only select a file if it is clearly required to perform the task.
+        # A repeat of the same question against the same agent and file
+        # state gets the cached reply; it is still appended to the
+        # conversation so the history reads the same as a fresh answer
+        response_key = (session_id, agent_flag, message, tuple(sorted(file_descriptions.items())))
+        cached_reply = _response_cache_get(response_key)
+        if cached_reply is not None:
+            await asyncio.to_thread(
+                session_config.add_conversation_message,
+                session_id, {"role": "agent", "content": cached_reply}
+            )
+            return {
+                "dataType": "data",
+                "message": cached_reply
+            }
 
-                Return:
-                - Just the name of the file (e.g., `document1`) or `None`.
-                """
-        response = llm.invoke(prompt)
-        file_name = response.content.split(".")[0]
+        # With no described files there is nothing to route to, so skip
+        # the LLM round trip outright; a message that names exactly one
+        # known file resolves without the LLM as well
+        mentioned = [name for name in file_descriptions if name.lower() in message.lower()]
+        if not file_descriptions:
+            file_name = "None"
+        elif len(mentioned) == 1:
+            file_name = mentioned[0]
+        else:
+            routing_key = (message, tuple(sorted(file_descriptions.items())))
+            file_name = _routing_cache_get(routing_key)
+            if file_name is None:
+                prompt = ROUTING_PROMPT_TEMPLATE.format(
+                    conversation_history=conversation_history,
+                    file_descriptions=file_descriptions
+                )
+                # ChatOpenAI has a native async path, so concurrent
+                # routing calls share the loop's network wait instead of
+                # each tying up a worker thread
+                response = await get_routing_llm().ainvoke(prompt)
+                file_name = response.content.split(".")[0]
+                _routing_cache_put(routing_key, file_name)
 
         print("file name :", file_name)
 
-        # Load agent configuration
-        config = load_agent_config()
-
-        discoverable_agents = display_available_agents(config)
-
         # check if the agent_flag is in the config
-        if agent_flag in discoverable_agents:
-            selected_agent = config['agents'][discoverable_agents.index(agent_flag)]
+        selected_agent = get_agents_by_flag().get(agent_flag)
+        if selected_agent:
             agent_url = get_agent_url(selected_agent['port'])
-            client = A2AClient(agent_url)
+            client = get_agent_client(agent_url)
         else:
             raise HTTPException(status_code=400, detail="Invalid agent flag")
         
@@ -308,26 +480,22 @@ async def ask_agent(
         # Collect all required inputs for the agent
         agent_inputs = create_agent_inputs(message, session_id, conversation_history, file_name, file_data, file_type)
 
-        # Create a message with the formatted inputs
+        # The only Message built per turn is the enriched one that
+        # actually goes over the wire
         user_message = Message(
             content=TextContent(text=agent_inputs),
             role=MessageRole.USER
         )
 
         # get the response from the agent
-        agent_response = client.send_message(user_message)
+        agent_response = await asyncio.to_thread(client.send_message, user_message)
         
-        # Create agent message
-        agent_message = Message(
-            content=TextContent(text=agent_response.content.text),
-            role=MessageRole.AGENT
+        # Add agent message to conversation history via the dict path
+        await asyncio.to_thread(
+            session_config.add_conversation_message,
+            session_id, {"role": "agent", "content": agent_response.content.text}
         )
-        
-        # Add agent message to conversation history
-        session_config.add_conversation_message(session_id, agent_message)
-        
-        # Get updated conversation history
-        conversation_history = session_config.get_conversation_history(session_id)
+        _response_cache_put(response_key, agent_response.content.text)
         
         return {
             "dataType": "data",
@@ -339,4 +507,18 @@ async def ask_agent(
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # uvloop + httptools cut event-loop and HTTP parsing overhead, and
+    # access logging is off on the hot path. Workers default to 1: the
+    # conversation write buffer, routing/response/session-info caches,
+    # and the config.json lock are all per-process, so multiple workers
+    # would serve stale history and lose each other's writes. Scale via
+    # API_WORKERS only once the session store is multi-process safe.
+    uvicorn.run(
+        "example_usage:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("API_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
@@ -1,29 +1,43 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from typing import Dict, Optional
 from datetime import datetime
 
+# Frozen models validate once and are hashable; nothing mutates them
+# after construction, and pydantic v2 skips building __setattr__ churn
+# for them on the request hot path.
+
 class QueryRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     userInput: str
     sessionID: UUID
 
 class DataFrameRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     userInput: str
     sessionID: UUID
     dataframe: Optional[Dict] = None  # JSON representation of DataFrame
 
 class Text2SQLRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     userInput: str
     sessionID: UUID
     schema: Optional[str] = None  # Database schema information
 
 class ConversationEntry(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     timestamp: datetime
     userInput: str
     response: dict
     agentType: str
 
 class AgentResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     session_id: UUID
     agent: str
     confidence: float
@@ -28,6 +28,27 @@ def load_agent_configs() -> Dict[str, Dict[str, Any]]:
 
 AGENTS = load_agent_configs()
 
+# One persistent client per agent, each bound to its UDS transport.
+# Building a client inside the handler paid a socket connect and
+# teardown on every forwarded request; these keep their connections
+# alive across calls.
+CLIENTS: Dict[str, httpx.AsyncClient] = {}
+
+@app.on_event("startup")
+async def create_agent_clients():
+    for name, config in AGENTS.items():
+        CLIENTS[name] = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=config["uds_path"]),
+            base_url="http://agent",
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+
+@app.on_event("shutdown")
+async def close_agent_clients():
+    for client in CLIENTS.values():
+        await client.aclose()
+    CLIENTS.clear()
+
 @app.post("/run/{agent_name}")
 async def forward_to_agent(agent_name: str, request: Request):
     if agent_name not in AGENTS:
@@ -42,15 +63,23 @@ async def forward_to_agent(agent_name: str, request: Request):
             detail=f"Agent '{agent_name}' is not running (socket not found)"
         )
     
+    # The gateway is a pure proxy: forward the raw bytes inside the
+    # {"data": ...} envelope instead of parsing the body only to
+    # re-encode it, which cost two JSON passes per hop. An empty body
+    # would make the envelope invalid JSON, so reject it here rather
+    # than letting the agent choke on it.
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=400, detail="Request body must not be empty")
+
     try:
-        data = await request.json()
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://127.0.0.1/run",  # Dummy URL, actual communication is via UDS
-                json={"data": data},
-                transport=httpx.HTTPTransport(uds=uds_path)
-            )
-            return response.json()
+        client = CLIENTS[agent_name]
+        response = await client.post(
+            "/run",
+            content=b'{"data":' + body + b'}',
+            headers={"content-type": "application/json"}
+        )
+        return response.json()
     except Exception as e:
         logger.error(f"Error forwarding request to agent {agent_name}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,13 @@
 from datetime import datetime, timedelta
 import os
+import socket
 import sys
 import time
 import shutil
 from typing import Dict, List, Optional, Tuple, Any
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 from agent_networks.text_processing_agent import TextProcessingAgent
 from agent_networks.eda_agent_network import EDAAgentNetwork
@@ -95,18 +96,55 @@ class AgentNetworkManager:
         self.conversation_history: Dict[UUID, List[ConversationEntry]] = {}
         self.session_config = SessionConfig()  # Initialize session configuration
 
+    # Agent ports the networks connect to, with their env overrides
+    AGENT_PORTS = [
+        ('SUMMARIZER_PORT', 5001),
+        ('TRANSLATOR_PORT', 5002),
+        ('DATA_ANALYSIS_PORT', 5003),
+        ('DATA_VISUALIZATION_PORT', 5004),
+        ('DATA_WRANGLING_PORT', 5005),
+        ('NLQ_RECONSTRUCTION_PORT', 5007),
+        ('GATING_PORT', 5008),
+        ('DYNAMIC_FEW_SHOTS_PORT', 5009),
+        ('SQL_GENERATION_PORT', 5010),
+    ]
+
     def initialize_networks(self) -> None:
         """Initialize agent networks."""
         self.networks['text'] = TextProcessingAgent()
         self.networks['eda'] = EDAAgentNetwork()
         self.networks['text2sql'] = Text2SQLAgentNetwork()
-        
+
         # Wait for networks to initialize
         print("Waiting for networks to initialize...")
-        time.sleep(3)
-        
+        self._wait_for_agents()
+
         self._print_available_networks()
 
+    def _wait_for_agents(self, timeout: float = 3.0) -> None:
+        """Poll the agent ports until they accept connections.
+
+        Replaces a fixed sleep: startup proceeds as soon as the agents
+        are reachable, and agents that never come up only cost the
+        timeout instead of hanging the manager. Unreachable agents are
+        reported but not fatal, matching the old sleep's behavior.
+        """
+        deadline = time.monotonic() + timeout
+        pending = {os.getenv(env, str(default)) for env, default in self.AGENT_PORTS}
+        delay = 0.05
+        while pending and time.monotonic() < deadline:
+            for port in list(pending):
+                try:
+                    with socket.create_connection(("localhost", int(port)), timeout=0.2):
+                        pending.discard(port)
+                except OSError:
+                    pass
+            if pending:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+        for port in pending:
+            print(f"Warning: agent on port {port} is not reachable yet")
+
     def _print_available_networks(self) -> None:
         """Print information about available networks."""
         for network_type, network in self.networks.items():
@@ -144,7 +182,11 @@ class AgentNetworkManager:
         })
 
 # Initialize FastAPI app
-app = FastAPI(title="Agent Network API", description="API for interacting with the agent network")
+app = FastAPI(
+    title="Agent Network API",
+    description="API for interacting with the agent network",
+    default_response_class=ORJSONResponse
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -326,7 +368,10 @@ app.include_router(text2sql_router)
 
 def main():
     """Main function to run the FastAPI application."""
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    # uvloop + httptools cut event-loop and HTTP parsing overhead; this
+    # app stays single-worker because conversation history lives in the
+    # AgentManager's process memory
+    uvicorn.run(app, host="0.0.0.0", port=8002, loop="uvloop", http="httptools")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,6 +6,7 @@ import pandas as pd
 from typing import Dict, List, Optional, Any, Union
 from uuid import UUID
 import shutil
+import threading
 from pathlib import Path
 import fitz  # PyMuPDF
 import pytesseract
@@ -15,10 +16,25 @@ from langchain_openai import ChatOpenAI
 from langchain_experimental.agents import create_pandas_dataframe_agent
 
 class SessionConfig:
+    # Buffered conversation messages per session before a flush is forced
+    _FLUSH_THRESHOLD = 8
+
     def __init__(self, base_dir: str = "temp_storage", max_age_hours: int = 4):
         self.base_dir = Path(base_dir)
         self.max_age = timedelta(hours=max_age_hours)
         self._ensure_base_dir()
+        # Per-session Message lists kept in memory so reading the
+        # history does not re-parse config.json and rebuild Message
+        # objects on every call
+        self._history_cache: Dict[UUID, List[Message]] = {}
+        # Conversation writes buffered per session; flushed to
+        # config.json when a session accumulates _FLUSH_THRESHOLD
+        # messages, before any disk read, or explicitly via
+        # flush_session/flush_all
+        self._pending: Dict[UUID, List[Dict[str, Any]]] = {}
+        # Serializes read-modify-write cycles on config.json so
+        # concurrent file registrations cannot drop each other's update
+        self._config_lock = threading.Lock()
         
     def _ensure_base_dir(self):
         """Ensure the base directory exists."""
@@ -54,6 +70,8 @@ class SessionConfig:
                 
     def get_session(self, session_id: UUID) -> Dict[str, Any]:
         """Get the configuration for a specific session."""
+        # Make sure buffered conversation writes are visible to readers
+        self.flush_session(session_id)
         config_file = self.get_session_dir(session_id) / "config.json"
         if not config_file.exists():
             return None
@@ -82,20 +100,21 @@ class SessionConfig:
         if not config_file.exists():
             self.create_session(session_id)
             
-        with open(config_file, "r") as f:
-            config = json.load(f)
-            
-        config["files"].append({file_name : {
-            "path": file_path,
-            "type": file_type,
-            "added_at": datetime.utcnow().isoformat(),
-            "description": file_description,
-            "file_data": file_data
-        }})
-        config["last_updated"] = datetime.utcnow().isoformat()
-        
-        with open(config_file, "w") as f:
-            json.dump(config, f, indent=2)
+        with self._config_lock:
+            with open(config_file, "r") as f:
+                config = json.load(f)
+
+            config["files"].append({file_name : {
+                "path": file_path,
+                "type": file_type,
+                "added_at": datetime.utcnow().isoformat(),
+                "description": file_description,
+                "file_data": file_data
+            }})
+            config["last_updated"] = datetime.utcnow().isoformat()
+
+            with open(config_file, "w") as f:
+                json.dump(config, f, indent=2)
             
     def get_session_files(self, session_id: UUID, file_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all files associated with a session, optionally filtered by type."""
@@ -146,25 +165,33 @@ class SessionConfig:
         config_file = self.get_session_dir(session_id) / "config.json"
         if not config_file.exists():
             self.create_session(session_id)
-            
-        with open(config_file, "r") as f:
-            config = json.load(f)
-            
+
         # Save DataFrame to CSV
         df_path = self.get_session_dir(session_id) / f"{name}.csv"
         df.to_csv(df_path, index=False)
-        
+
         # Get dataset description
         description = self.get_file_description(str(df_path), "csv")
-        
-        config["dataframes"][name] = {
-            "path": str(df_path),
-            "added_at": datetime.utcnow().isoformat()
-        }
-        config["last_updated"] = datetime.utcnow().isoformat()
-        
-        with open(config_file, "w") as f:
-            json.dump(config, f, indent=2)
+
+        with self._config_lock:
+            with open(config_file, "r") as f:
+                config = json.load(f)
+
+            config["dataframes"][name] = {
+                "path": str(df_path),
+                "added_at": datetime.utcnow().isoformat(),
+                "description": description,
+                # Schema snapshot recorded once so info endpoints can
+                # serve it without re-reading the CSV
+                "meta": {
+                    "columns": df.columns.tolist(),
+                    "shape": list(df.shape)
+                }
+            }
+            config["last_updated"] = datetime.utcnow().isoformat()
+
+            with open(config_file, "w") as f:
+                json.dump(config, f, indent=2)
             
     def get_dataframe(self, session_id: UUID, name: str) -> Optional[pd.DataFrame]:
         """Get a DataFrame from the session configuration."""
@@ -212,12 +239,16 @@ class SessionConfig:
             created_at = datetime.fromisoformat(config["created_at"])
             if current_time - created_at > self.max_age:
                 shutil.rmtree(session_dir)
+                self._history_cache.pop(UUID(session_dir.name), None)
+                self._pending.pop(UUID(session_dir.name), None)
                 
     def cleanup_all(self) -> None:
         """Remove all session data."""
         if self.base_dir.exists():
             shutil.rmtree(self.base_dir)
         self._ensure_base_dir()
+        self._history_cache.clear()
+        self._pending.clear()
 
     def add_conversation_message(self, session_id: UUID, message: Union[Message, Dict[str, Any]]) -> None:
         """Add a message to the conversation history.
@@ -226,13 +257,6 @@ class SessionConfig:
             session_id: The session ID
             message: Either a python_a2a Message object or a dictionary with message details
         """
-        config_file = self.get_session_dir(session_id) / "config.json"
-        if not config_file.exists():
-            self.create_session(session_id)
-            
-        with open(config_file, "r") as f:
-            config = json.load(f)
-            
         # Convert dictionary to Message if needed
         if isinstance(message, dict):
             message = Message(
@@ -247,22 +271,60 @@ class SessionConfig:
             "timestamp": datetime.utcnow().isoformat()
         }
 
+        # Buffer the write; each message used to rewrite the whole
+        # config file, so a chat turn paid two full rewrites
+        pending = self._pending.setdefault(session_id, [])
+        pending.append(message_dict)
+        if len(pending) >= self._FLUSH_THRESHOLD:
+            self.flush_session(session_id)
 
-        if "conversation" not in config:
-            config["conversation"] = {
-                "messages": [],
-                "last_updated": datetime.utcnow().isoformat()
-            }
+        # Keep the in-memory history in step with the buffered write
+        if session_id in self._history_cache:
+            self._history_cache[session_id].append(message)
+
+    def flush_session(self, session_id: UUID) -> None:
+        """Write a session's buffered conversation messages to disk."""
+        pending = self._pending.pop(session_id, None)
+        if not pending:
+            return
+
+        config_file = self.get_session_dir(session_id) / "config.json"
+        if not config_file.exists():
+            self.create_session(session_id)
             
-        config["conversation"]["messages"].append(message_dict)
-        config["conversation"]["last_updated"] = datetime.utcnow().isoformat()
-        config["last_updated"] = datetime.utcnow().isoformat()
-        
-        with open(config_file, "w") as f:
-            json.dump(config, f, indent=2)
+        with self._config_lock:
+            with open(config_file, "r") as f:
+                config = json.load(f)
+
+            if "conversation" not in config:
+                config["conversation"] = {
+                    "messages": [],
+                    "last_updated": datetime.utcnow().isoformat()
+                }
+
+            config["conversation"]["messages"].extend(pending)
+            config["conversation"]["last_updated"] = datetime.utcnow().isoformat()
+            config["last_updated"] = datetime.utcnow().isoformat()
+
+            with open(config_file, "w") as f:
+                json.dump(config, f, indent=2)
+
+    def flush_all(self) -> None:
+        """Flush buffered conversation messages for every session."""
+        for session_id in list(self._pending):
+            self.flush_session(session_id)
             
     def get_conversation_history(self, session_id: UUID) -> List[Message]:
-        """Get the conversation history for a session as Message objects."""
+        """Get the conversation history for a session as Message objects.
+
+        Served from the in-memory cache after the first read; the disk
+        copy is only parsed when the session is not cached yet.
+        """
+        cached = self._history_cache.get(session_id)
+        if cached is not None:
+            return cached
+
+        # Cold read: get_session flushes any buffered messages first
         config = self.get_session(session_id)
         if not config:
             return []
@@ -275,17 +337,32 @@ class SessionConfig:
                 role=MessageRole.USER if msg["role"] == "user" else MessageRole.AGENT
             )
             messages.append(message)
-            
+
+        self._history_cache[session_id] = messages
         return messages
 
-    def process_pdf_file(self, session_id: UUID, file_path: str) -> str:
+    def get_conversation_messages(self, session_id: UUID) -> List[Dict[str, Any]]:
+        """Get the conversation history as the stored message dicts.
+
+        Callers that only need role/content/timestamp read the stored
+        form directly instead of round-tripping through Message objects.
+        """
+        # get_session flushes any buffered messages first
+        config = self.get_session(session_id)
+        if not config:
+            return []
+        return config.get("conversation", {}).get("messages", [])
+
+    def process_pdf_file(self, session_id: UUID, file_path: str, data: Optional[bytes] = None) -> str:
         """Extract text from a PDF file and store it."""
         session_dir = self.get_session_dir(session_id)
         pdf_path = Path(file_path)
         
-        # Extract text from PDF
+        # Extract text from PDF, straight from memory when the bytes
+        # are already in hand
         text_content = []
-        with fitz.open(pdf_path) as doc:
+        doc = fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(pdf_path)
+        with doc:
             for page in doc:
                 text_content.append(page.get_text())
         
@@ -296,13 +373,13 @@ class SessionConfig:
             
         return str(text_file)
         
-    def process_image_file(self, session_id: UUID, file_path: str) -> str:
+    def process_image_file(self, session_id: UUID, file_path: str, data: Optional[bytes] = None) -> str:
         """Extract text from an image file using OCR and store it."""
         session_dir = self.get_session_dir(session_id)
         image_path = Path(file_path)
         
         # Extract text using OCR
-        image = Image.open(image_path)
+        image = Image.open(io.BytesIO(data)) if data is not None else Image.open(image_path)
         text_content = pytesseract.image_to_string(image)
         
         # Save extracted text
@@ -312,13 +389,35 @@ class SessionConfig:
             
         return str(text_file)
         
-    def process_csv_file(self, session_id: UUID, file_path: str) -> str:
+    @staticmethod
+    def _shrink_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """Downcast column dtypes to cut the frame's memory footprint.
+
+        Integer and float columns drop to the narrowest dtype that
+        holds their values, and low-cardinality text columns become
+        categoricals; the values themselves are unchanged.
+        """
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_integer_dtype(series):
+                df[column] = pd.to_numeric(series, downcast="integer")
+            elif pd.api.types.is_float_dtype(series):
+                df[column] = pd.to_numeric(series, downcast="float")
+            elif pd.api.types.is_object_dtype(series):
+                if len(series) and series.nunique(dropna=False) / len(series) < 0.5:
+                    df[column] = series.astype("category")
+        return df
+
+    def process_csv_file(self, session_id: UUID, file_path: str, data: Optional[bytes] = None) -> str:
         """Process a CSV file and store it as a DataFrame with description."""
         session_dir = self.get_session_dir(session_id)
         csv_path = Path(file_path)
         
-        # Read CSV into DataFrame
-        df = pd.read_csv(csv_path)
+        # Read CSV into DataFrame and shrink it before anything holds on
+        # to it; wide uploads otherwise sit in memory as all-int64/float64
+        df = self._shrink_dataframe(
+            pd.read_csv(io.BytesIO(data)) if data is not None else pd.read_csv(csv_path)
+        )
         
         # Save DataFrame with unique name
         df_name = f"{csv_path.stem}"
@@ -326,7 +425,19 @@ class SessionConfig:
         
         return df_name
 
-    def process_file(self, session_id: UUID, file_path: str) -> Dict[str, Any]:
+    def process_bytes(self, session_id: UUID, data: bytes, filename: str) -> Dict[str, Any]:
+        """Persist uploaded bytes once and process them from memory.
+
+        Writes the payload a single time into the session directory and
+        hands the in-memory bytes to the processors, so uploads skip
+        the temp-file write/read/delete round trip entirely.
+        """
+        file_path = self.get_session_dir(session_id) / filename
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return self.process_file(session_id, str(file_path), data)
+
+    def process_file(self, session_id: UUID, file_path: str, data: Optional[bytes] = None) -> Dict[str, Any]:
         """Process a file based on its type and store the results."""
         file_path = Path(file_path)
         file_type = file_path.suffix.lower()[1:]  # Remove the dot
@@ -341,13 +452,13 @@ class SessionConfig:
         try:
             processed_path = None
             if file_type == "pdf":
-                processed_path = self.process_pdf_file(session_id, str(file_path))
+                processed_path = self.process_pdf_file(session_id, str(file_path), data)
                 result["content_type"] = "text"
             elif file_type in ["jpg", "jpeg", "png", "bmp", "tiff"]:
-                processed_path = self.process_image_file(session_id, str(file_path))
+                processed_path = self.process_image_file(session_id, str(file_path), data)
                 result["content_type"] = "text"
             elif file_type == "csv":
-                df_name = self.process_csv_file(session_id, str(file_path))
+                df_name = self.process_csv_file(session_id, str(file_path), data)
                 result["dataframe_name"] = df_name
                 result["content_type"] = "dataframe"
                 processed_path = str(self.get_session_dir(session_id) / f"{df_name}.csv")
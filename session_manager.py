@@ -1,34 +1,90 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from uuid import UUID
 from runnable_config import SessionConfig
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import threading
+import time
 
 class SessionManager:
+    # Upper bound on concurrently tracked sessions; the least recently
+    # used session is evicted when it is reached
+    MAX_SESSIONS = 10_000
+
     def __init__(self, base_dir: str = "temp_storage", max_age_hours: int = 4):
-        self._sessions: Dict[UUID, SessionConfig] = {}
+        self._sessions: "OrderedDict[UUID, SessionConfig]" = OrderedDict()
+        self._last_access: Dict[UUID, float] = {}
         self._lock = threading.Lock()
         self.base_dir = base_dir
         self.max_age_hours = max_age_hours
         self.max_age = timedelta(hours=max_age_hours)
-        
+        # Idle TTL in seconds; sessions untouched for longer are evicted
+        self._ttl = self.max_age.total_seconds()
+
+    def _touch(self, session_id: UUID) -> None:
+        """Mark a session as recently used. Caller must hold the lock."""
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+
+    def _evict(self, session_id: UUID) -> None:
+        """Drop a session from tracking. Caller must hold the lock."""
+        session_config = self._sessions.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+        if session_config is not None:
+            session_config.flush_all()
+
+    def _evict_stale(self) -> None:
+        """Evict idle and over-limit sessions. Caller must hold the lock."""
+        now = time.monotonic()
+        # OrderedDict iterates least recently used first, so stop at the
+        # first fresh entry
+        while self._sessions:
+            session_id = next(iter(self._sessions))
+            if now - self._last_access[session_id] < self._ttl:
+                break
+            self._evict(session_id)
+        while len(self._sessions) > self.MAX_SESSIONS:
+            self._evict(next(iter(self._sessions)))
+
     def get_session(self, session_id: UUID) -> Optional[SessionConfig]:
         """Get a session configuration by ID."""
         with self._lock:
-            return self._sessions.get(session_id)
-            
+            session_config = self._sessions.get(session_id)
+            if session_config is not None:
+                self._touch(session_id)
+            return session_config
+
+    def get_with_data(self, session_id: UUID) -> Optional[Tuple[SessionConfig, Dict]]:
+        """Get a session's config and stored data in one lookup.
+
+        Takes the lock once for the tracking lookup; the config read
+        happens outside it since it may touch disk. Returns None when
+        the session is unknown or has no stored data.
+        """
+        with self._lock:
+            session_config = self._sessions.get(session_id)
+            if session_config is None:
+                return None
+            self._touch(session_id)
+        session = session_config.get_session(session_id)
+        if not session:
+            return None
+        return session_config, session
+
     def create_session(self, session_id: UUID) -> SessionConfig:
         """Create a new session configuration."""
         with self._lock:
             if session_id not in self._sessions:
+                self._evict_stale()
                 session_config = SessionConfig(
                     base_dir=f"{self.base_dir}/{session_id}",
                     max_age_hours=self.max_age_hours
                 )
                 self._sessions[session_id] = session_config
                 session_config.create_session(session_id)
+            self._touch(session_id)
             return self._sessions[session_id]
-            
+
     def cleanup_old_sessions(self) -> None:
         """Remove sessions older than max_age."""
         current_time = datetime.utcnow()
@@ -40,15 +96,35 @@ class SessionManager:
                     created_at = datetime.fromisoformat(session["created_at"])
                     if current_time - created_at > self.max_age:
                         sessions_to_remove.append(session_id)
-                        
+
             for session_id in sessions_to_remove:
-                del self._sessions[session_id]
-                
+                self._evict(session_id)
+
+    def delete_session(self, session_id: UUID) -> bool:
+        """Delete a single session and its on-disk data.
+
+        Returns True if the session was tracked, False otherwise.
+        """
+        with self._lock:
+            session_config = self._sessions.pop(session_id, None)
+            self._last_access.pop(session_id, None)
+        if session_config is None:
+            return False
+        session_config.cleanup_all()
+        return True
+
+    def flush_all(self) -> None:
+        """Flush buffered conversation writes for every session."""
+        with self._lock:
+            for session_config in self._sessions.values():
+                session_config.flush_all()
+
     def cleanup_all(self) -> None:
         """Remove all sessions."""
         with self._lock:
             self._sessions.clear()
-            
+            self._last_access.clear()
+
     def get_all_sessions(self) -> Dict[str, Dict]:
         """Get information about all active sessions."""
         with self._lock:
@@ -65,4 +141,4 @@ class SessionManager:
                         "dataframe_count": len(session.get("dataframes", {})),
                         "message_count": len(session.get("conversation", {}).get("messages", []))
                     }
-            return sessions_info 
\ No newline at end of file
+            return sessions_info